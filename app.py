@@ -2,10 +2,32 @@
 # Cleanups: remove duplicate /set_lang route, keep preview filter & Chart API,
 # unify NewsData cooldown, single cache path, safe dotenv load.
 
-import os, time, json, re, html, difflib, urllib.parse, datetime as dt, logging, requests
+import os, time, re, html, hashlib, heapq, tempfile, urllib.parse, datetime as dt, logging, asyncio, threading, requests
+import httpx, orjson
+import numpy as np
+from datasketch import MinHash, MinHashLSH
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Iterable
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
+from typing import List, Dict, Any, Iterable, Tuple
+from flask import Flask, render_template, jsonify, make_response, request, session, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+# --- Optional: C ISO-8601 parser; stdlib fallback below if not installed ---
+try:
+    import ciso8601
+except Exception:
+    ciso8601 = None
+
+# --- Optional: POSIX file locks (refresher election without Redis); absent on Windows dev boxes ---
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # --- Optional: load .env locally; safe if python-dotenv isn't installed in prod ---
 try:
@@ -17,7 +39,21 @@ except Exception:
 # --------------------------------------------------------------------------------------
 # App / env
 # --------------------------------------------------------------------------------------
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() via orjson: encodes straight to bytes, several times faster than stdlib json."""
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Behind the platform proxy, trust exactly that many X-Forwarded-For hops (appended right-most by the
+# proxy) so request.remote_addr is the real client. 0 = direct exposure: never read XFF.
+PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", "0"))
+if PROXY_FIX_X_FOR > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_FIX_X_FOR)
 
 # Session secret (needed for language toggle)
 # Use env key if provided; otherwise generate a temporary one so the app doesn't 500.
@@ -52,24 +88,92 @@ def inject_cache_bust():
 # Paths / Admin
 DATA_DIR = "data"
 NEWS_CACHE_PATH = os.path.join(DATA_DIR, f"news_cache_{CACHE_VERSION}.json")
+TRANSLATION_CACHE_PATH = os.path.join(DATA_DIR, "translation_cache.json")
 ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # optional simple admin token
 
 # Rate-limit cooldown (NewsData)
+# Monotonic deadline (immune to wall-clock jumps), written under a lock; mirrored to Redis
+# (when configured) so every worker honors a 429 seen by any of them.
 NEWSDATA_COOLDOWN_SEC = 15 * 60  # 15 minutes
-_newsd_cooldown_until = 0
+NEWSDATA_COOLDOWN_KEY = "newsdata:cooldown"
+_cooldown_lock = threading.Lock()
+_newsd_cooldown_until = 0.0
 def newsdata_on_cooldown() -> bool:
-    return time.time() < _newsd_cooldown_until
+    if rds is not None:
+        try:
+            if rds.exists(NEWSDATA_COOLDOWN_KEY):
+                return True
+        except Exception:
+            pass
+    return time.monotonic() < _newsd_cooldown_until
+def start_newsdata_cooldown() -> None:
+    global _newsd_cooldown_until
+    with _cooldown_lock:
+        _newsd_cooldown_until = max(_newsd_cooldown_until, time.monotonic() + NEWSDATA_COOLDOWN_SEC)
+    if rds is not None:
+        try:
+            rds.setex(NEWSDATA_COOLDOWN_KEY, NEWSDATA_COOLDOWN_SEC, "1")
+        except Exception as e:
+            log.warning("Redis cooldown save failed: %s", e)
+
+# --- Optional: shared Redis cache across workers; falls back to in-process/file if unset ---
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+rds = None
+if REDIS_URL:
+    try:
+        import redis
+        rds = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    except Exception as e:
+        log.warning("Redis unavailable (%s); using in-process cache.", e)
+        rds = None
+
+# --- Optional: server-side sessions in Redis so the cookie is just a short SID ---
+if rds is not None:
+    try:
+        from flask_session import Session
+        app.config.update(
+            SESSION_TYPE="redis",
+            SESSION_REDIS=redis.Redis.from_url(REDIS_URL),  # flask-session stores bytes; no decode_responses
+            SESSION_KEY_PREFIX="sess:",
+        )
+        Session(app)
+    except Exception as e:
+        log.warning("flask-session unavailable (%s); using signed-cookie sessions.", e)
+
+# --- Optional: gzip/brotli for JSON + HTML responses (ETags get a ":gzip"-style suffix) ---
+try:
+    from flask_compress import Compress
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json", "text/html"],
+        COMPRESS_LEVEL=6,
+        COMPRESS_MIN_SIZE=500,
+    )
+    Compress(app)
+except Exception as e:
+    log.warning("flask-compress unavailable (%s); serving uncompressed.", e)
 
 # Simple per-key TTL cache (e.g., OHLC)
 _CACHE: Dict[str, Any] = {}
 _CACHE_TTL_SEC = 10 * 60
 def _cache_get(key):
+    if rds is not None:
+        try:
+            raw = rds.get(key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            log.warning("Redis get %s failed: %s", key, e)
     rec = _CACHE.get(key)
     if not rec:
         return None
     ts, data = rec
     return data if (time.time() - ts) < _CACHE_TTL_SEC else None
 def _cache_put(key, data):
+    if rds is not None:
+        try:
+            rds.setex(key, _CACHE_TTL_SEC, orjson.dumps(data))
+            return
+        except Exception as e:
+            log.warning("Redis setex %s failed: %s", key, e)
     _CACHE[key] = (time.time(), data)
 
 # --------------------------------------------------------------------------------------
@@ -87,8 +191,13 @@ def set_lang():
 # --------------------------------------------------------------------------------------
 # Template filters
 # --------------------------------------------------------------------------------------
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+PREVIEW_LIMIT = 380
+
 @app.template_filter('preview')
-def preview(text, limit=380):
+def preview(text, limit=PREVIEW_LIMIT):
     """
     Strip HTML, collapse whitespace, and truncate with a word-safe ellipsis.
     Returns a plain string (safe to render).
@@ -96,46 +205,112 @@ def preview(text, limit=380):
     if not text:
         return ""
     s = str(text)
-    s = re.sub(r"<[^>]+>", " ", s)          # strip tags
+    s = _TAG_RE.sub(" ", s)                  # strip tags
     s = html.unescape(s)                     # decode entities
-    s = re.sub(r"\s+", " ", s).strip()       # collapse whitespace
+    s = _WS_RE.sub(" ", s).strip()           # collapse whitespace
     if len(s) <= limit:
         return s
     cut = s[:limit].rsplit(" ", 1)[0]        # avoid mid-word cut
     return f"{cut}…"
 
+@app.template_filter('tr')
+def tr(field, lang="EN"):
+    """{{ item.title | tr(current_lang) }} — EN text, or FR (translated on demand if missing)."""
+    if not isinstance(field, dict):
+        return field or ""
+    en = field.get("en") or ""
+    if (lang or "EN").upper() != "FR":
+        return en
+    return field.get("fr") or translate_to_french(en)
+
+# --------------------------------------------------------------------------------------
+# Async HTTP fan-out (GNews / NewsData)
+# --------------------------------------------------------------------------------------
+HTTP_TIMEOUT_SEC = 20
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+def _async_client() -> httpx.AsyncClient:
+    """
+    One pooled client per refresh cycle. An AsyncClient's connection pool is bound
+    to the event loop that first used it, and each fetch_ai_news() runs its own loop.
+    """
+    return httpx.AsyncClient(timeout=HTTP_TIMEOUT_SEC, limits=HTTP_LIMITS)
+
+# Shared keep-alive pool for the remaining sync calls (RapidAPI chart, Google Translate)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                       max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+SESSION.mount("https://", _adapter)
+
+# --------------------------------------------------------------------------------------
+# Conditional GET for provider calls (ETag / Last-Modified)
+# --------------------------------------------------------------------------------------
+UPSTREAM_VALIDATORS_MAX = 256
+# request key -> (etag, last_modified, parsed JSON of the last 200); bounded LRU
+_UPSTREAM: "OrderedDict[str, tuple]" = OrderedDict()
+
+def _upstream_key(url: str, params: dict) -> str:
+    # Credentials are left out of the key; everything else identifies the request
+    return url + "?" + urllib.parse.urlencode(sorted((k, str(v)) for k, v in params.items() if k not in ("apikey", "token")))
+
+async def conditional_get(client: httpx.AsyncClient, url: str, params: dict) -> Tuple[httpx.Response, Any]:
+    """
+    GET that replays the last validators as If-None-Match / If-Modified-Since.
+    Returns (response, data): data is the parsed body on 200, the remembered body on 304, else None.
+    """
+    key = _upstream_key(url, params)
+    prev = _UPSTREAM.get(key)
+    headers = {}
+    if prev:
+        if prev[0]: headers["If-None-Match"] = prev[0]
+        if prev[1]: headers["If-Modified-Since"] = prev[1]
+    r = await client.get(url, params=params, headers=headers)
+    if r.status_code == 304 and prev:
+        _UPSTREAM.move_to_end(key)
+        return r, prev[2]
+    if r.status_code != 200:
+        return r, None
+    try:
+        data = r.json()
+    except Exception:
+        return r, None
+    etag, last_mod = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or last_mod:
+        _UPSTREAM[key] = (etag, last_mod, data)
+        _UPSTREAM.move_to_end(key)
+        while len(_UPSTREAM) > UPSTREAM_VALIDATORS_MAX:
+            _UPSTREAM.popitem(last=False)
+    return r, data
+
 # --------------------------------------------------------------------------------------
 # NewsData wrapper with cooldown
 # --------------------------------------------------------------------------------------
-def newsdata_get(url: str, params: dict):
+async def newsdata_get(client: httpx.AsyncClient, url: str, params: dict):
     """
-    Wrapper around requests.get for NewsData.io that:
+    Wrapper around client.get for NewsData.io that:
     - skips calls while in cooldown
-    - starts cooldown on HTTP 429
+    - starts cooldown on HTTP 429 (from any response in a gathered batch)
     - logs concise messages
     Returns parsed JSON dict on success, or None on skip/error.
     """
-    global _newsd_cooldown_until
     if newsdata_on_cooldown():
         app.logger.info("NewsData: on cooldown; skipping call.")
         return None
     try:
-        r = requests.get(url, params=params, timeout=20)
+        r, data = await conditional_get(client, url, params)
     except Exception as e:
         app.logger.warning(f"NewsData network error: {e}")
         return None
     if r.status_code == 429:
-        _newsd_cooldown_until = time.time() + NEWSDATA_COOLDOWN_SEC
+        start_newsdata_cooldown()
         app.logger.warning("NewsData 429 rate limit — cooling down for %d sec.", NEWSDATA_COOLDOWN_SEC)
         return None
     if r.status_code >= 400:
         app.logger.warning("NewsData HTTP %s: %s", r.status_code, r.text[:200])
         return None
-    try:
-        return r.json()
-    except Exception:
+    if data is None:
         app.logger.warning("NewsData: failed to parse JSON.")
-        return None
+    return data
 
 # --------------------------------------------------------------------------------------
 # Finance: Yahoo chart fetcher
@@ -144,46 +319,46 @@ def fetch_yahoo_chart(symbol: str, range_: str, interval: str):
     """
     Returns {"symbol": "TSM", "points": [ {t,o,h,l,c,v}, ... ]}
     """
-    import requests
-    from datetime import datetime, timezone
-
     symbol = symbol.upper()
     range_ = range_.lower()
     interval = interval.lower()
 
-    ck = f"{symbol}|{range_}|{interval}"
+    ck = f"ohlc:{symbol}:{range_}:{interval}"
     cached = _cache_get(ck)
     if cached:
         return cached
 
-    def _trim_ytd(pts):
-        if range_ != "ytd" or not pts:
-            return pts
+    def _ytd_start(t_ms):
+        # Yahoo timestamps are ascending: binary-search the Jan 1 cutoff instead of filtering every point
+        if range_ != "ytd":
+            return 0
         jan1 = datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc).timestamp() * 1000
-        return [p for p in pts if p["t"] >= jan1]
+        return int(np.searchsorted(t_ms, jan1, side="left"))
 
     def _build_points_from_yahoo(payload):
         result = payload.get("chart", {}).get("result", [{}])[0]
         ts_list = result.get("timestamp") or []
         ind = result.get("indicators", {}).get("quote", [{}])[0]
-        o = ind.get("open", []) or []
-        h = ind.get("high", []) or []
-        l = ind.get("low", []) or []
-        c = ind.get("close", []) or []
-        v = ind.get("volume", []) or []
-        pts = []
-        for i, ts in enumerate(ts_list):
-            if ts is None or i >= len(c) or c[i] in (None, "null"):
-                continue
-            pts.append({
-                "t": int(ts) * 1000,
-                "o": None if i >= len(o) else o[i],
-                "h": None if i >= len(h) else h[i],
-                "l": None if i >= len(l) else l[i],
-                "c": c[i],
-                "v": None if i >= len(v) else v[i],
-            })
-        return pts
+        n = len(ts_list)
+        if not n:
+            return []
+        def _col(vals):
+            # Pad/trim to len(timestamps); None / "null" → NaN
+            out = np.full(n, np.nan)
+            vals = (vals or [])[:n]
+            if vals:
+                arr = np.array(vals, dtype=object)
+                arr[np.equal(arr, None) | (arr == "null")] = np.nan
+                out[:len(vals)] = arr.astype(float)
+            return out
+        ts = np.array(ts_list, dtype=object)
+        t_ok = ~np.equal(ts, None)
+        o, h, l, c, v = (_col(ind.get(k)) for k in ("open", "high", "low", "close", "volume"))
+        keep = t_ok & ~np.isnan(c)
+        t_ms = ts[keep].astype(np.int64) * 1000
+        i0 = _ytd_start(t_ms)
+        cols = [t_ms[i0:].tolist()] + [np.where(np.isnan(a[keep][i0:]), None, a[keep][i0:]).tolist() for a in (o, h, l, c, v)]
+        return [dict(zip(("t", "o", "h", "l", "c", "v"), row)) for row in zip(*cols)]
 
     def _try_rapidapi():
         key = os.getenv("YF_RAPIDAPI_KEY", "").strip()
@@ -196,10 +371,9 @@ def fetch_yahoo_chart(symbol: str, range_: str, interval: str):
             "X-RapidAPI-Key": key,
             "X-RapidAPI-Host": "apidojo-yahoo-finance-v1.p.rapidapi.com",
         }
-        r = requests.get(url, params=params, headers=headers, timeout=20)
+        r = SESSION.get(url, params=params, headers=headers, timeout=20)
         r.raise_for_status()
-        pts = _build_points_from_yahoo(r.json())
-        return _trim_ytd(pts)
+        return _build_points_from_yahoo(r.json())
 
     def _try_yfinance():
         try:
@@ -223,25 +397,15 @@ def fetch_yahoo_chart(symbol: str, range_: str, interval: str):
         df = yf.Ticker(symbol).history(period=r_, interval=i_, auto_adjust=False)
         if df is None or df.empty:
             return []
-        df = df.reset_index()
+        df = df.reset_index().rename(columns={"Datetime": "Date"})  # intraday index is "Datetime"
         if range_ == "ytd":
             year = pd.Timestamp.utcnow().year
             df = df[df["Date"].dt.year == year]
-        pts = []
-        for _, row in df.iterrows():
-            ts = int(pd.Timestamp(row["Date"]).timestamp() * 1000)
-            close = row.get("Close")
-            if close is None:
-                continue
-            pts.append({
-                "t": ts,
-                "o": float(row.get("Open")) if pd.notna(row.get("Open")) else None,
-                "h": float(row.get("High")) if pd.notna(row.get("High")) else None,
-                "l": float(row.get("Low")) if pd.notna(row.get("Low")) else None,
-                "c": float(close) if pd.notna(close) else None,
-                "v": float(row.get("Volume")) if pd.notna(row.get("Volume")) else None,
-            })
-        return pts
+        cols = {"Open": "o", "High": "h", "Low": "l", "Close": "c", "Volume": "v"}
+        out = df[list(cols)].rename(columns=cols).astype(float)
+        out.insert(0, "t", (pd.to_datetime(df["Date"], utc=True) - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1))
+        out = out[out["c"].notna()]
+        return out.astype(object).where(out.notna(), None).to_dict("records")
 
     source = "rapidapi"
     pts = _try_rapidapi()
@@ -262,11 +426,15 @@ def fetch_yahoo_chart(symbol: str, range_: str, interval: str):
 # --------------------------------------------------------------------------------------
 @app.route("/admin/flush-cache/<token>")
 def flush_cache(token):
+    global _NEWS_MEM
     if not ADMIN_TOKEN or token != ADMIN_TOKEN:
         return {"ok": False, "error": "unauthorized"}, 401
     try:
+        _NEWS_MEM = []  # else this worker keeps serving the old list until its next refresh
         if os.path.exists(NEWS_CACHE_PATH):
             os.remove(NEWS_CACHE_PATH)
+        if rds is not None:
+            rds.delete(NEWS_REDIS_KEY)
         return {"ok": True, "message": "cache cleared"}
     except Exception as e:
         return {"ok": False, "error": str(e)}, 500
@@ -312,6 +480,15 @@ NEWSDATA_BIZ_QUERIES = [
 # Utilities
 # --------------------------------------------------------------------------------------
 _WORD_RE = re.compile(r"[A-Za-z0-9]+")
+
+@lru_cache(maxsize=4096)
+def _norm_text(title: str, summary: str) -> str:
+    """Lowercased "title summary" (exact classifier join, no stripping), shared by classify and dedupe."""
+    return f"{title} {summary}".lower()
+
+@lru_cache(maxsize=4096)
+def _norm_tokens(norm: str) -> frozenset:
+    return frozenset(_WORD_RE.findall(norm))
 def _norm_title_key(title: str) -> str:
     toks = _WORD_RE.findall((title or "").lower())
     return " ".join(toks)
@@ -321,11 +498,36 @@ def _url_key(url: str) -> str:
         return f"{(u.netloc or '').lower()}{(u.path or '').lower()}"
     except Exception:
         return (url or "").lower().strip()
-def _fuzzy_dup(a: str, b: str, ratio_threshold: float) -> bool:
-    return difflib.SequenceMatcher(None, (a or "").lower(), (b or "").lower()).ratio() >= ratio_threshold
-def _parse_iso_to_naive_utc(ts: str) -> dt.datetime:
-    if not ts:
-        return dt.datetime.utcnow()
+MINHASH_PERM = 64
+MINHASH_CANDIDATE_JACCARD = 0.5  # loose LSH recall stage; exact token Jaccard makes the final call
+DEDUPE_JACCARD = 0.8             # near-dup if |A ∩ B| / |A ∪ B| >= this over title+summary word sets
+# Topic buckets for the per-topic cap: whole-word lookup, first bucket in TOPIC_PRIORITY wins
+TOPIC_PRIORITY = ["lawsuit", "finance", "nvidia", "microsoft", "google", "meta", "amazon"]
+TOPIC_KEYWORDS: Dict[str, str] = {
+    "lawsuit": "lawsuit", "lawsuits": "lawsuit", "sue": "lawsuit", "sues": "lawsuit", "sued": "lawsuit", "suing": "lawsuit",
+    "earnings": "finance", "revenue": "finance", "revenues": "finance", "investment": "finance", "investments": "finance",
+    "nvidia": "nvidia", "chip": "nvidia", "chips": "nvidia", "semiconductor": "nvidia", "semiconductors": "nvidia",
+    "microsoft": "microsoft",
+    "google": "google", "alphabet": "google", "deepmind": "google",
+    "meta": "meta",
+    "amazon": "amazon",
+}
+_TOPIC_RANK = {t: i for i, t in enumerate(TOPIC_PRIORITY)}
+
+def _topic_key(tokens: Iterable[str]) -> str:
+    """Topic bucket from an article's lowercased word-token set (hash lookups, no substring scans)."""
+    hits = [TOPIC_KEYWORDS[w] for w in tokens if w in TOPIC_KEYWORDS]
+    return min(hits, key=_TOPIC_RANK.__getitem__) if hits else "other"
+
+@lru_cache(maxsize=2048)
+def _parse_iso_cached(ts: str) -> dt.datetime | None:
+    """Naive UTC datetime or None. Memoized: duplicate stories share the same publishedAt."""
+    if ciso8601 is not None:
+        try:
+            d = ciso8601.parse_datetime(ts.strip())
+            return d.astimezone(timezone.utc).replace(tzinfo=None) if d.tzinfo else d
+        except ValueError:
+            pass
     t = ts.strip().replace("UTC", "+0000")
     try:
         if " " in t and "T" not in t:
@@ -344,7 +546,11 @@ def _parse_iso_to_naive_utc(ts: str) -> dt.datetime:
             return dtobj.astimezone(timezone.utc).replace(tzinfo=None)
         return dtobj
     except Exception:
+        return None
+def _parse_iso_to_naive_utc(ts: str) -> dt.datetime:
+    if not ts:
         return dt.datetime.utcnow()
+    return _parse_iso_cached(ts) or dt.datetime.utcnow()
 def _title_text(s: Dict[str, Any]) -> str:
     t = s.get("title")
     if isinstance(t, dict):
@@ -352,44 +558,44 @@ def _title_text(s: Dict[str, Any]) -> str:
     return (t or "").strip()
 
 # De-dupe
-def deduplicate_by_token_set(articles, threshold: int = 90, max_per_topic: int = 2):
-    ratio_threshold = max(0.0, min(1.0, threshold / 100.0))
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+def deduplicate_by_token_set(articles, threshold: float = DEDUPE_JACCARD, max_per_topic: int = 2):
+    """
+    Drop exact (title/URL) and near duplicates, then cap stories per topic.
+    Near-dup = word-set Jaccard >= threshold, checked only against MinHash-LSH candidates.
+    """
+    articles = list(articles or [])
+    # One pass up front: keys, token set and topic per article
+    token_sets, tkeys, ukeys, topics = [], [], [], []
+    for s in articles:
+        title = _title_text(s)
+        toks = _norm_tokens(_norm_text(title, s.get("summary", {}).get("en") or ""))
+        token_sets.append(toks)
+        tkeys.append(_norm_title_key(title))
+        ukeys.append(_url_key((s.get("url") or "").strip()))
+        topics.append(_topic_key(toks))
+    sigs = MinHash.bulk([[t.encode("utf-8") for t in toks] for toks in token_sets], num_perm=MINHASH_PERM) if articles else []
+
     seen_title_keys, seen_url_keys = set(), set()
     kept = []
     topic_counts = {}
-    def topic_key(story: Dict[str, Any]) -> str:
-        text = (_title_text(story) + " " + (story.get("summary", {}).get("en") or "")).lower()
-        if "lawsuit" in text or "sue" in text:
-            return "lawsuit"
-        if "earnings" in text or "revenue" in text or "investment" in text:
-            return "finance"
-        if "nvidia" in text or "chip" in text or "semiconductor" in text:
-            return "nvidia"
-        if "microsoft" in text:
-            return "microsoft"
-        if "google" in text or "alphabet" in text or "deepmind" in text:
-            return "google"
-        if "meta" in text:
-            return "meta"
-        if "amazon" in text:
-            return "amazon"
-        return "other"
-    for s in articles or []:
-        title = _title_text(s)
-        url = (s.get("url") or "").strip()
-        summary = (s.get("summary", {}).get("en") or "").strip()
-        tkey = _norm_title_key(title)
-        ukey = _url_key(url)
+    lsh = MinHashLSH(threshold=MINHASH_CANDIDATE_JACCARD, num_perm=MINHASH_PERM)
+    for i, s in enumerate(articles):
+        tkey, ukey, tcluster = tkeys[i], ukeys[i], topics[i]
         if tkey in seen_title_keys or (ukey and ukey in seen_url_keys):
             continue
-        if any(_fuzzy_dup(title + " " + summary, _title_text(k) + " " + (k.get("summary", {}).get("en") or ""), ratio_threshold) for k in kept):
+        cands = lsh.query(sigs[i])
+        if any(_jaccard(token_sets[i], token_sets[int(k)]) >= threshold for k in cands):
             continue
-        tcluster = topic_key(s)
         if topic_counts.get(tcluster, 0) >= max_per_topic:
             continue
         topic_counts[tcluster] = topic_counts.get(tcluster, 0) + 1
         seen_title_keys.add(tkey)
         if ukey: seen_url_keys.add(ukey)
+        lsh.insert(str(i), sigs[i])
         kept.append(s)
     return kept
 
@@ -401,72 +607,359 @@ def merge_sort_cap(all_stories: Iterable[Dict[str, Any]], cap: int = MAX_TOTAL_S
         except Exception:
             return dt.datetime.min
     merged = list(all_stories)
-    merged.sort(key=ts, reverse=True)
-    return merged[:cap]
+    # Timestamp column parsed once, then a top-k select (same order as a stable reverse sort + slice)
+    stamps = [ts(s) for s in merged]
+    top = heapq.nlargest(cap, range(len(merged)), key=stamps.__getitem__)
+    return [merged[i] for i in top]
 
 # --------------------------------------------------------------------------------------
 # Helpers (translate, classify, cache)
 # --------------------------------------------------------------------------------------
-def translate_to_french(text: str) -> str:
-    text = text or ""
-    if not text:
-        return ""
-    if not TRANSLATE_ENABLED or not GOOGLE_API_KEY:
-        return text  # disabled → echo EN
-    url = "https://translation.googleapis.com/language/translate/v2"
-    params = {"q": text, "target": "fr", "format": "text", "key": GOOGLE_API_KEY}
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write via a unique temp file in the same dir + os.replace: safe across threads and workers."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+TRANSLATE_BATCH_MAX = 128      # Google v2 limit on repeated q= per request
+TRANSLATE_CHARS_MAX = 5000     # recommended max total characters per request
+TRANSLATE_MEMO_MAX = 4096
+TRANSLATE_REDIS_TTL_SEC = 30 * 24 * 3600  # news:trans:<sha1> hashes expire; live headlines get re-saved
+TRANSLATE_COOLDOWN_SEC = 60  # after a failed call, serve cached FR / EN fallback instead of waiting on Google
+TRANSLATE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="translate")
+
+# EN → FR memo shared by every refresh (bounded LRU; only successful translations are stored)
+_FR_MEMO: "OrderedDict[str, str]" = OrderedDict()
+_FR_MEMO_LOCK = threading.Lock()  # request threads (FR views) and the refresher share it
+def _memo_put(src: str, fr: str) -> None:
+    with _FR_MEMO_LOCK:
+        _FR_MEMO[src] = fr
+        _FR_MEMO.move_to_end(src)
+        while len(_FR_MEMO) > TRANSLATE_MEMO_MAX:
+            _FR_MEMO.popitem(last=False)
+
+def _memo_get(texts: Iterable[str]) -> Dict[str, str]:
+    """Memo hits for texts (refreshing their LRU position)."""
+    out = {}
+    with _FR_MEMO_LOCK:
+        for t in texts:
+            fr = _FR_MEMO.get(t)
+            if fr is not None:
+                _FR_MEMO.move_to_end(t)
+                out[t] = fr
+    return out
+
+# Translate failure backoff: same monotonic-deadline pattern as the NewsData cooldown, kept
+# per process since FR request threads check it on every page.
+_translate_cooldown_until = 0.0
+def translate_on_cooldown() -> bool:
+    return time.monotonic() < _translate_cooldown_until
+def start_translate_cooldown() -> None:
+    global _translate_cooldown_until
+    with _cooldown_lock:
+        _translate_cooldown_until = max(_translate_cooldown_until, time.monotonic() + TRANSLATE_COOLDOWN_SEC)
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def _trans_key(text: str) -> str:
+    return "news:trans:" + _sha1(text)
+
+# On-disk sidecar {sha1(en): fr} so restarts don't re-pay for strings already translated
+# bounded like _FR_MEMO: the file keeps the TRANSLATE_MEMO_MAX most recently written entries
+_disk_trans: Dict[str, str] | None = None
+_disk_trans_lock = threading.Lock()
+
+def _disk_trans_read() -> Dict[str, str]:
+    try:
+        with open(TRANSLATION_CACHE_PATH, "rb") as f:
+            raw = orjson.loads(f.read())
+        return raw if isinstance(raw, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.warning("Translation cache load error: %s", e); return {}
+
+def _disk_trans_load() -> Dict[str, str]:
+    global _disk_trans
+    if _disk_trans is None:
+        _disk_trans = _disk_trans_read()
+    return _disk_trans
+
+def _disk_trans_get(texts: List[str]) -> List[str]:
+    """Seed the memo from the sidecar file; returns the texts still missing."""
+    if not texts:
+        return texts
+    with _disk_trans_lock:
+        disk = _disk_trans_load()
+    missing = []
+    for t in texts:
+        fr = disk.get(_sha1(t))
+        if fr: _memo_put(t, fr)
+        else: missing.append(t)
+    return missing
+
+def _disk_trans_put(pairs: Dict[str, str]) -> None:
+    global _disk_trans
+    if not pairs:
+        return
+    with _disk_trans_lock:
+        # Start from the file (other workers write it too), append ours newest-last, trim the oldest
+        disk = OrderedDict(_disk_trans_read())
+        for src, fr in pairs.items():
+            k = _sha1(src)
+            disk[k] = fr
+            disk.move_to_end(k)
+        while len(disk) > TRANSLATE_MEMO_MAX:
+            disk.popitem(last=False)
+        _disk_trans = disk
+        try:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            _atomic_write(TRANSLATION_CACHE_PATH, orjson.dumps(disk))
+        except Exception as e:
+            log.warning("Translation cache save error: %s", e)
+
+def _redis_trans_get(texts: List[str]) -> List[str]:
+    """Seed the memo from Redis (HGET news:trans:<sha1> fr); returns the texts still missing."""
+    if rds is None or not texts:
+        return texts
+    try:
+        pipe = rds.pipeline()
+        for t in texts:
+            pipe.hget(_trans_key(t), "fr")
+        hits = pipe.execute()
+    except Exception as e:
+        log.warning("Redis translation lookup failed: %s", e); return texts
+    missing = []
+    for t, fr in zip(texts, hits):
+        if fr: _memo_put(t, fr)
+        else: missing.append(t)
+    return missing
+
+def _redis_trans_put(pairs: Dict[str, str]) -> None:
+    if rds is None or not pairs:
+        return
     try:
-        resp = requests.post(url, data=params, timeout=8)
+        pipe = rds.pipeline()
+        for src, fr in pairs.items():
+            key = _trans_key(src)
+            pipe.hset(key, "fr", fr)
+            pipe.expire(key, TRANSLATE_REDIS_TTL_SEC)
+        pipe.execute()
+    except Exception as e:
+        log.warning("Redis translation save failed: %s", e)
+
+def _translate_chunks(texts: List[str]) -> Iterable[List[str]]:
+    """Split into requests of ≤TRANSLATE_BATCH_MAX strings and ≤TRANSLATE_CHARS_MAX characters."""
+    chunk: List[str] = []
+    size = 0
+    for t in texts:
+        if chunk and (len(chunk) >= TRANSLATE_BATCH_MAX or size + len(t) > TRANSLATE_CHARS_MAX):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(t)
+        size += len(t)
+    if chunk:
+        yield chunk
+
+def _translate_post(chunk: List[str]) -> Dict[str, str]:
+    """One v2 request; {} on failure (or during the failure cooldown) so callers fall back to EN."""
+    if translate_on_cooldown():
+        return {}
+    data = [("q", t) for t in chunk] + [("target", "fr"), ("format", "text"), ("key", GOOGLE_API_KEY)]
+    try:
+        resp = SESSION.post(TRANSLATE_URL, data=data, timeout=8)
         if resp.status_code == 200:
-            return resp.json()["data"]["translations"][0]["translatedText"]
-        else:
-            log.warning("Translate failed %s: %s", resp.status_code, resp.text[:140])
+            return {src: tr["translatedText"] for src, tr in zip(chunk, resp.json()["data"]["translations"])}
+        log.warning("Translate failed %s: %s", resp.status_code, resp.text[:140])
     except Exception as e:
         log.warning("Translate exception: %s", e)
-    return text
+    start_translate_cooldown()
+    return {}
 
-def classify_article(title_en: str, summary_en: str) -> List[str]:
-    text = f"{title_en} {summary_en}".lower()
-    cats = set()
-    if any(k in text for k in [
+def translate_batch(texts: Iterable[str]) -> Dict[str, str]:
+    """
+    Translate many strings with one POST per chunk (repeated q= params, see _translate_chunks).
+    Returns {en: fr} for strings that were translated; failures are left out (callers fall back to EN).
+    With translation disabled every string maps to itself.
+    """
+    uniq = list(dict.fromkeys(t for t in texts if t))
+    if not uniq:
+        return {}
+    if not TRANSLATE_ENABLED or not GOOGLE_API_KEY:
+        return {t: t for t in uniq}  # disabled → echo EN
+    # memo → sidecar file → Redis → Google; only true misses are sent upstream
+    hits = _memo_get(uniq)
+    misses = _redis_trans_get(_disk_trans_get([t for t in uniq if t not in hits]))
+    if translate_on_cooldown():
+        misses = []  # recent failure: answer from the caches only, no upstream wait
+    chunks = list(_translate_chunks(misses))
+    # Chunks are independent POSTs: overlap them on the pooled Session (memo/cache writes stay here)
+    results = TRANSLATE_POOL.map(_translate_post, chunks) if len(chunks) > 1 else map(_translate_post, chunks)
+    fresh = {src: fr for part in results for src, fr in part.items()}
+    for src, fr in fresh.items():
+        _memo_put(src, fr)
+    _redis_trans_put(fresh)
+    _disk_trans_put(fresh)
+    # sidecar/Redis hits were seeded into the memo above
+    out = _memo_get(t for t in uniq if t not in hits and t not in fresh)
+    out.update(hits)
+    out.update(fresh)
+    return out
+
+def translate_to_french(text: str) -> str:
+    text = text or ""
+    if not text:
+        return ""
+    return translate_batch([text]).get(text, text)
+
+def fill_translations(stories: List[Dict[str, Any]]) -> None:
+    """Fill the {"fr": None} placeholders left by _normalize_story with a single batch call."""
+    pending = [f["en"] for s in stories for f in (s.get("title"), s.get("summary"))
+               if isinstance(f, dict) and f.get("fr") is None and f.get("en")]
+    fr = translate_batch(pending)
+    for s in stories:
+        for f in (s.get("title"), s.get("summary")):
+            # Only real translations stick: on a transient failure fr stays None and is retried next time
+            if isinstance(f, dict) and f.get("fr") is None:
+                en = f.get("en") or ""
+                if not en or en in fr:
+                    f["fr"] = fr.get(en, "")
+        summary = s.get("summary")
+        if s.get("preview_fr") is None and isinstance(summary, dict) and summary.get("fr") is not None:
+            s["preview_fr"] = preview(summary["fr"], PREVIEW_LIMIT)
+
+def localize(stories: List[Dict[str, Any]], lang: str) -> List[Dict[str, Any]]:
+    """Translate lazily, per request: only FR viewers trigger (memoized) translation."""
+    if (lang or "EN").upper() == "FR":
+        fill_translations(stories)
+    return stories
+
+# Category → keywords (plain substring semantics, same as the old `k in text` checks)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "finance": [
         "earnings", "revenue", "profit", "quarter", "guidance", "valuation",
         "ipo", "stock", "shares", "market cap", "dividend", "buyback",
         "funding", "raised", "seed", "series a", "series b", "venture",
         "acquisition", "merger", "m&a", "spinoff"
-    ]): cats.add("finance")
-    if any(k in text for k in ["lawsuit", "sues", "sued", "settlement", "complaint", "class action"]): cats.add("Law")
-    if any(k in text for k in [
+    ],
+    "Law": ["lawsuit", "sues", "sued", "settlement", "complaint", "class action"],
+    "Policy": [
         "regulation", "regulatory", "eu ai act", "sec", "ftc", "doj",
         "bill", "senate", "house committee", "white house", "executive order",
         "ofcom", "ico (uk)"
-    ]): cats.add("Policy")
-    if any(k in text for k in ["safety", "red team", "alignment", "guardrail", "mitigation", "harm reduction"]): cats.add("Safety")
-    if any(k in text for k in ["breach", "leak", "ransomware", "compromise", "exploit", "zero-day", "privacy"]): cats.add("Security")
-    if any(k in text for k in ["nvidia", "gpu", "h100", "h200", "blackwell", "chip", "semiconductor", "data center", "accelerator"]): cats.add("Hardware")
-    if any(k in text for k in ["benchmark", "paper", "arxiv", "sota", "state-of-the-art", "researchers", "dataset"]): cats.add("Research")
-    if any(k in text for k in ["open source", "apache-2.0", "mit license", "oss"]): cats.add("Open Source")
-    if any(k in text for k in ["launch", "rollout", "release", "update", "feature", "preview", "private beta", "general availability"]): cats.add("Product")
-    company_hit = any(k in text for k in [
-        "openai", "anthropic", "mistral", "deepmind", "google", "alphabet",
-        "microsoft", "meta", "amazon", "amd", "xai", "databricks", "snowflake"
-    ])
-    if any(k in text for k in [
+    ],
+    "Safety": ["safety", "red team", "alignment", "guardrail", "mitigation", "harm reduction"],
+    "Security": ["breach", "leak", "ransomware", "compromise", "exploit", "zero-day", "privacy"],
+    "Hardware": ["nvidia", "gpu", "h100", "h200", "blackwell", "chip", "semiconductor", "data center", "accelerator"],
+    "Research": ["benchmark", "paper", "arxiv", "sota", "state-of-the-art", "researchers", "dataset"],
+    "Open Source": ["open source", "apache-2.0", "mit license", "oss"],
+    "Product": ["launch", "rollout", "release", "update", "feature", "preview", "private beta", "general availability"],
+    "Model": [
         "gpt", "chatgpt", "gpt-4", "gpt-4o", "gpt-4.1", "gpt-5",
         "claude", "llama", "gemma", "gemini", "grok", "mistral", "mixtral",
-        "sonnet", "haiku", "opus", "sora"
-    ]) or "model" in text: cats.add("Model")
+        "sonnet", "haiku", "opus", "sora", "model"
+    ],
+}
+COMPANY_KEYWORDS = [
+    "openai", "anthropic", "mistral", "deepmind", "google", "alphabet",
+    "microsoft", "meta", "amazon", "amd", "xai", "databricks", "snowflake"
+]
+CATEGORY_ORDER = ["Model", "Hardware", "Research", "Open Source", "Product", "Safety", "Security", "Policy", "Law", "finance", "AI"]
+
+def _alternation(words: Iterable[str]) -> re.Pattern:
+    # Longest first so e.g. "gpt-4o" wins over "gpt" at the same position
+    return re.compile("|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True)))
+
+def _keyword_labels() -> Dict[str, frozenset]:
+    """keyword → labels; "_company" marks COMPANY_KEYWORDS (only consulted when no category hits)."""
+    labels: Dict[str, set] = {}
+    for cat, kws in CATEGORY_KEYWORDS.items():
+        for k in kws:
+            labels.setdefault(k, set()).add(cat)
+    for k in COMPANY_KEYWORDS:
+        labels.setdefault(k, set()).add("_company")
+    # A match reports only the longest keyword at its start, so fold in labels of its prefixes too
+    return {k: frozenset().union(*(v for p, v in labels.items() if k.startswith(p))) for k in labels}
+
+_KEYWORD_LABELS = _keyword_labels()
+# One pass over the text for every category: the lookahead is zero-width, so overlapping
+# keywords still hit at their own start positions (same as independent `k in text` checks)
+_KEYWORD_RE = re.compile("(?=(%s))" % _alternation(_KEYWORD_LABELS).pattern)
+
+def classify_article(title_en: str, summary_en: str) -> List[str]:
+    text = _norm_text(title_en, summary_en)
+    hits = set().union(*(_KEYWORD_LABELS[m.group(1)] for m in _KEYWORD_RE.finditer(text)))
+    cats = hits - {"_company"}
     if not cats:
-        cats.add("Product" if company_hit else "AI")
-    order = ["Model", "Hardware", "Research", "Open Source", "Product", "Safety", "Security", "Policy", "Law", "finance", "AI"]
-    final = [c for c in order if c in cats]
+        cats.add("Product" if "_company" in hits else "AI")
+    final = [c for c in CATEGORY_ORDER if c in cats]
     return final or ["AI"]
 
+NEWS_REDIS_KEY = "news:latest"
+NEWS_LOCK_KEY = "lock:news:latest"
+NEWSDATA_MAX_PAGES = 3       # nextPage hops per query (sequential, so they bound refresh time)
+# Outlive the slowest refresh: per sequential request up to connect + read timeouts, pages + the concurrent GNews round
+NEWS_LOCK_TTL_SEC = HTTP_TIMEOUT_SEC * 2 * (NEWSDATA_MAX_PAGES + 1)
+# Compare-and-delete: only the holder's token may release (an expired lock may belong to another worker now)
+_RELEASE_LOCK_LUA = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+SEEN_URLS_MAX = 1000          # published URL keys remembered across refreshes
+DEDUPE_CACHE_WINDOW = 200     # newest cached stories a refresh is fuzzy-checked against
+
+def load_shared_payload() -> Dict[str, Any]:
+    """{"cached_at", "news"} from Redis (key expires after CACHE_TTL_MINUTES); {} if absent or no Redis."""
+    if rds is None:
+        return {}
+    try:
+        raw = rds.get(NEWS_REDIS_KEY)
+        payload = orjson.loads(raw) if raw else {}
+        return payload if isinstance(payload, dict) else {}
+    except Exception as e:
+        log.warning("Redis news load error: %s", e); return {}
+
+def load_shared_news() -> List[Dict[str, Any]]:
+    items = load_shared_payload().get("news")
+    return items if isinstance(items, list) else []
+
+def acquire_news_lock() -> str | None:
+    """
+    SET NX EX mutex so only one worker refreshes at a time.
+    Returns the holder token (pass it to release_news_lock), or None if another worker holds the lock.
+    """
+    token = os.urandom(16).hex()
+    if rds is None:
+        return token
+    try:
+        return token if rds.set(NEWS_LOCK_KEY, token, nx=True, ex=NEWS_LOCK_TTL_SEC) else None
+    except Exception as e:
+        log.warning("Redis lock error: %s", e); return token
+
+def release_news_lock(token: str) -> None:
+    if rds is None:
+        return
+    try:
+        rds.eval(_RELEASE_LOCK_LUA, 1, NEWS_LOCK_KEY, token)
+    except Exception:
+        pass
+
 def load_cache() -> List[Dict[str, Any]]:
+    shared = load_shared_news()
+    if shared:
+        log.info("Loaded Redis cache: %d items", len(shared)); return shared
     try:
         if not os.path.exists(NEWS_CACHE_PATH):
             return []
-        with open(NEWS_CACHE_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        with open(NEWS_CACHE_PATH, "rb") as f:
+            raw = orjson.loads(f.read())
         if isinstance(raw, list):
             log.info("Loaded legacy cache list: %d items", len(raw)); return raw
         if isinstance(raw, dict) and isinstance(raw.get("news"), list):
@@ -476,12 +969,34 @@ def load_cache() -> List[Dict[str, Any]]:
     except Exception as e:
         log.warning("Cache load error: %s", e); return []
 
-def save_cache(items: List[Dict[str, Any]]) -> None:
+def load_seen_urls() -> List[str]:
+    """URL keys of every story already published (oldest first); outlives the capped news list."""
+    seen = load_shared_payload().get("seen_urls")
+    if isinstance(seen, list):
+        return seen
+    try:
+        if not os.path.exists(NEWS_CACHE_PATH):
+            return []
+        with open(NEWS_CACHE_PATH, "rb") as f:
+            raw = orjson.loads(f.read())
+        seen = raw.get("seen_urls") if isinstance(raw, dict) else None
+        return seen if isinstance(seen, list) else []
+    except Exception as e:
+        log.warning("Seen-URL load error: %s", e); return []
+
+def save_cache(items: List[Dict[str, Any]], seen_urls: List[str] | None = None) -> None:
     try:
         os.makedirs(DATA_DIR, exist_ok=True)
         payload = {"cached_at": datetime.utcnow().isoformat(), "news": items}
-        with open(NEWS_CACHE_PATH, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        if seen_urls is not None:
+            payload["seen_urls"] = seen_urls[-SEEN_URLS_MAX:]
+        if rds is not None:
+            try:
+                rds.setex(NEWS_REDIS_KEY, CACHE_TTL_MINUTES * 60, orjson.dumps(payload))
+            except Exception as e:
+                log.warning("Redis news save error: %s", e)
+        # File copy stays as the restart / Redis-down fallback; atomic so a crash can't truncate it
+        _atomic_write(NEWS_CACHE_PATH, orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
         log.info("Cache saved: %d items", len(items))
     except Exception as e:
         log.warning("Cache save error: %s", e)
@@ -497,32 +1012,96 @@ def _normalize_story(title_en: str, summary_en: str, url: str, image_url: str,
         out_tags.append("finance")
     return {
         "timestamp": _parse_iso_to_naive_utc(pub).isoformat(),
-        "title": {"en": title_en, "fr": translate_to_french(title_en)},
-        "summary": {"en": summary_en, "fr": translate_to_french(summary_en)},
+        "title": {"en": title_en, "fr": None},      # filled lazily by localize()
+        "summary": {"en": summary_en, "fr": None},
         "url": url,
         "image_url": image_url or None,
         "source": source,
         "categories": cats,
         "tags": out_tags,
+        # Derived once at ingest so templates render {{ item.preview_en }} without regex work
+        "preview_en": preview(summary_en, PREVIEW_LIMIT),
+        "preview_fr": None,                         # set alongside summary.fr
     }
 
-def fetch_gnews_articles_for_query(q: str, max_items: int = 8) -> List[Dict[str, Any]]:
-    if not GNEWS_API_KEY:
-        return []
-    base = "https://gnews.io/api/v4/search"
+GNEWS_SEARCH_URL = "https://gnews.io/api/v4/search"
+NEWSDATA_LATEST_URL = "https://newsdata.io/api/1/latest"
+
+async def fetch_gnews_articles_for_query(client: httpx.AsyncClient, q: str, max_items: int = 8) -> List[Dict[str, Any]]:
     params = {"q": q, "lang": "en", "max": str(max_items), "token": GNEWS_API_KEY, "sortby": "publishedAt"}
-    r = requests.get(base, params=params, timeout=12)
-    if r.status_code != 200:
+    try:
+        r, data = await conditional_get(client, GNEWS_SEARCH_URL, params)
+    except Exception as e:
+        log.warning("GNews network error for q='%s': %s", q, e); return []
+    if r.status_code not in (200, 304):
         log.warning("GNews error %s for q='%s': %s", r.status_code, q, r.text[:140]); return []
-    return (r.json() or {}).get("articles", [])
+    if data is None:
+        log.warning("GNews: failed to parse JSON for q='%s'.", q); return []
+    return (data or {}).get("articles", [])
+
+async def _newsdata_fetch_query(client: httpx.AsyncClient, category: str, q: str, total_target: int) -> List[Dict[str, Any]]:
+    """Raw NewsData results for one query, following nextPage until total_target rows (≤ NEWSDATA_MAX_PAGES)."""
+    rows: List[Dict[str, Any]] = []
+    next_page = None
+    for _ in range(NEWSDATA_MAX_PAGES):
+        if len(rows) >= total_target: break
+        params = {"apikey": NEWSDATA_API_KEY, "category": category, "language": "en", "q": q}
+        if next_page: params["page"] = next_page
+        data = await newsdata_get(client, NEWSDATA_LATEST_URL, params)
+        if not data:
+            break
+        results = data.get("results", []) or []
+        rows.extend(results)
+        next_page = data.get("nextPage")
+        if not next_page or not results: break
+    return rows
+
+QUERY_WAVE_SIZE = 1  # queries per provider in flight at once; one usually fills its target
+
+async def _fetch_until(queries: List[str], fetch_one, target: int) -> List[List[Dict[str, Any]]]:
+    """
+    Run queries in waves of QUERY_WAVE_SIZE and stop once the batches hold target rows,
+    so a provider is only asked for as many queries as the normalizer will actually use.
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    have = 0
+    for i in range(0, len(queries), QUERY_WAVE_SIZE):
+        if have >= target:
+            break
+        wave = await asyncio.gather(*(fetch_one(q) for q in queries[i:i + QUERY_WAVE_SIZE]))
+        batches.extend(wave)
+        have += sum(len(rows) for rows in wave)
+    return batches
+
+async def _fetch_raw_batches(gnews_target: int, newsdata_target: int):
+    """
+    Fetch the three providers concurrently over one client; within each, queries run in waves
+    until its target is met (wall time ≈ slowest provider, request count ≈ what is used).
+    Returns (gnews_batches, tech_batches, biz_batches), one list of raw rows per query sent.
+    """
+    async def none() -> List[List[Dict[str, Any]]]:
+        return []
+    g_job, t_job, b_job = none(), none(), none()
+    async with _async_client() as client:
+        if GNEWS_API_KEY:
+            g_job = _fetch_until(GNEWS_QUERIES, lambda q: fetch_gnews_articles_for_query(
+                client, q, max_items=min(8, gnews_target)), gnews_target)
+        if NEWSDATA_API_KEY:
+            if newsdata_on_cooldown():
+                log.info("NewsData: on cooldown; skipping call.")
+            else:
+                t_job = _fetch_until(NEWSDATA_TECH_QUERIES, lambda q: _newsdata_fetch_query(
+                    client, "technology", q, newsdata_target), newsdata_target)
+                b_job = _fetch_until(NEWSDATA_BIZ_QUERIES, lambda q: _newsdata_fetch_query(
+                    client, "business", q, newsdata_target), newsdata_target)
+        g, t, b = await asyncio.gather(g_job, t_job, b_job)
+    return g, t, b
 
-def fetch_gnews_ai(total_target: int = 8) -> List[Dict[str, Any]]:
+def fetch_gnews_ai(batches: List[List[Dict[str, Any]]], total_target: int = 8) -> List[Dict[str, Any]]:
     collected: List[Dict[str, Any]] = []
-    for q in GNEWS_QUERIES:
-        if len(collected) >= total_target: break
-        remaining = total_target - len(collected)
-        raw = fetch_gnews_articles_for_query(q, max_items=min(8, remaining))
+    for raw in batches:
         for a in raw:
+            if len(collected) >= total_target: break
             title_en = a.get("title", "") or ""
             desc_en = a.get("description", "") or ""
             published = a.get("publishedAt") or a.get("published_at") or ""
@@ -533,58 +1112,68 @@ def fetch_gnews_ai(total_target: int = 8) -> List[Dict[str, Any]]:
     log.info("GNews normalized stories (multi-query): %d", len(collected))
     return collected
 
-def _newsdata_fetch_queries(category: str, queries: List[str], total_target: int, finance: bool) -> List[Dict[str, Any]]:
-    if not NEWSDATA_API_KEY:
-        return []
-    base = "https://newsdata.io/api/1/latest"
+def _newsdata_normalize(category: str, batches: List[List[Dict[str, Any]]], total_target: int, finance: bool) -> List[Dict[str, Any]]:
     collected: List[Dict[str, Any]] = []
-    for q in queries:
+    for results in batches:
         if len(collected) >= total_target: break
-        next_page = None
-        while len(collected) < total_target:
-            params = {"apikey": NEWSDATA_API_KEY, "category": category, "language": "en", "q": q}
-            if next_page: params["page"] = next_page
-            data = newsdata_get(base, params)
-            if not data:
-                break
-            results = data.get("results", [])
-            for r in results:
-                title_en = (r.get("title") or "").strip()
-                url = r.get("link") or r.get("url") or ""
-                if not title_en or not url: continue
-                src = (r.get("source_id") or r.get("source") or "NewsData").strip()
-                summary_en = (r.get("description") or r.get("content") or "").strip()
-                pub = r.get("pubDate") or r.get("published_at") or ""
-                collected.append(_normalize_story(
-                    title_en, summary_en, url, r.get("image_url") or r.get("image"),
-                    src, pub, (["finance","ai"] if finance else ["ai"])
-                ))
-                if len(collected) >= total_target: break
-            next_page = (data or {}).get("nextPage")
-            if not next_page or not results: break
+        for r in results:
+            title_en = (r.get("title") or "").strip()
+            url = r.get("link") or r.get("url") or ""
+            if not title_en or not url: continue
+            src = (r.get("source_id") or r.get("source") or "NewsData").strip()
+            summary_en = (r.get("description") or r.get("content") or "").strip()
+            pub = r.get("pubDate") or r.get("published_at") or ""
+            collected.append(_normalize_story(
+                title_en, summary_en, url, r.get("image_url") or r.get("image"),
+                src, pub, (["finance","ai"] if finance else ["ai"])
+            ))
+            if len(collected) >= total_target: break
     log.info("NewsData %s normalized stories (multi-query): %d", category, len(collected))
     return collected
 
-def fetch_newsdata_ai(total_target: int = 6) -> List[Dict[str, Any]]:
-    return _newsdata_fetch_queries("technology", NEWSDATA_TECH_QUERIES, total_target, finance=False)
-def fetch_newsdata_business_ai(total_target: int = 6) -> List[Dict[str, Any]]:
-    return _newsdata_fetch_queries("business", NEWSDATA_BIZ_QUERIES, total_target, finance=True)
+def fetch_newsdata_ai(batches: List[List[Dict[str, Any]]], total_target: int = 6) -> List[Dict[str, Any]]:
+    return _newsdata_normalize("technology", batches, total_target, finance=False)
+def fetch_newsdata_business_ai(batches: List[List[Dict[str, Any]]], total_target: int = 6) -> List[Dict[str, Any]]:
+    return _newsdata_normalize("business", batches, total_target, finance=True)
 
 # --------------------------------------------------------------------------------------
 # Unified builder
 # --------------------------------------------------------------------------------------
-def fetch_ai_news() -> List[Dict[str, Any]]:
+async def fetch_ai_news_async() -> List[Dict[str, Any]]:
+    """Live pipeline: fetch → dedupe → cap → translate → save. Called by the refresher, not routes."""
+    lock_token = acquire_news_lock()
+    if lock_token is None:
+        # Another worker is refreshing; serve the last known copy rather than stampede upstream.
+        cached = load_cache()
+        if cached:
+            log.info("Refresh in progress elsewhere; serving cache: %d", len(cached))
+            return cached[:MAX_TOTAL_STORIES]
     try:
-        gnews = fetch_gnews_ai(8)
-        tech = fetch_newsdata_ai(6)
-        finance = fetch_newsdata_business_ai(6)
+        g_raw, t_raw, b_raw = await _fetch_raw_batches(gnews_target=8, newsdata_target=6)
+        gnews = fetch_gnews_ai(g_raw, 8)
+        tech = fetch_newsdata_ai(t_raw, 6)
+        finance = fetch_newsdata_business_ai(b_raw, 6)
         log.info("Pre-dedupe counts | GNews: %d | NewsData-tech: %d | NewsData-biz: %d", len(gnews), len(tech), len(finance))
-        combined = deduplicate_by_token_set([*gnews, *tech, *finance], threshold=92)
-        log.info("Post-dedupe count: %d", len(combined))
-        final = merge_sort_cap(combined, cap=MAX_TOTAL_STORIES)
+        fresh = [*gnews, *tech, *finance]
+        final: List[Dict[str, Any]] = []
+        if fresh:
+            # Dedupe new stories against the previous cached set (Redis or the cache file, EN only)
+            # too. The pool is sorted newest first and dedupe keeps the first copy, so of two
+            # near-duplicates the newer one survives; the cached copy wins only on equal timestamps.
+            previous = load_cache()[:DEDUPE_CACHE_WINDOW]
+            # Anything published before (still cached or aged out) is dropped by one dict probe,
+            # before any MinHash work; insertion-ordered so the persisted list trims oldest first.
+            seen = dict.fromkeys(load_seen_urls())
+            seen.update((k, None) for s in previous if (k := _url_key(s.get("url") or "")))
+            fresh = [s for s in fresh if _url_key(s.get("url") or "") not in seen]
+            pool = merge_sort_cap([*previous, *fresh], cap=len(previous) + len(fresh))
+            combined = deduplicate_by_token_set(pool)
+            log.info("Post-dedupe count: %d (pool: %d fresh + %d cached)", len(combined), len(fresh), len(previous))
+            final = combined[:MAX_TOTAL_STORIES]
+            seen.update((k, None) for s in final if (k := _url_key(s.get("url") or "")))
         log.info("Final (capped) count: %d", len(final))
         if final:
-            save_cache(final)
+            save_cache(final, seen_urls=list(seen))  # EN only; French is filled on demand by localize()
             return final
         cached = load_cache()
         if cached:
@@ -599,37 +1188,173 @@ def fetch_ai_news() -> List[Dict[str, Any]]:
             log.warning("Error fallback to cache: %d", len(cached))
             return cached[:MAX_TOTAL_STORIES]
         return []
+    finally:
+        if lock_token is not None:
+            release_news_lock(lock_token)
+
+def fetch_ai_news() -> List[Dict[str, Any]]:
+    """Sync entry point for scripts / one-off refreshes."""
+    return asyncio.run(fetch_ai_news_async())
+
+# --------------------------------------------------------------------------------------
+# Background refresh (stale-while-revalidate): routes only ever read the cache
+# --------------------------------------------------------------------------------------
+NEWS_REFRESH_SEC = int(os.getenv("NEWS_REFRESH_SEC", str(CACHE_TTL_MINUTES * 60)))
+BACKGROUND_REFRESH = os.getenv("BACKGROUND_REFRESH", "1").strip() in ("1", "true", "True", "yes", "on")
+REFRESH_FOLLOWER_POLL_SEC = 60        # non-refreshing workers re-read the shared copy (and retry election)
+REFRESHER_LOCK_PATH = os.path.join(DATA_DIR, "news_refresher.lock")
+_NEWS_MEM: List[Dict[str, Any]] = []   # last list this worker built or adopted
+_refresh_thread = None
+_refresh_start_lock = threading.Lock()
+_refresher_fd = None
+
+def _age_sec(iso_ts: str) -> float:
+    try:
+        return (datetime.utcnow() - datetime.fromisoformat(iso_ts)).total_seconds()
+    except Exception:
+        return float("inf")
+
+async def refresh_news() -> None:
+    global _NEWS_MEM
+    shared = load_shared_payload()
+    if isinstance(shared.get("news"), list) and _age_sec(shared.get("cached_at") or "") < NEWS_REFRESH_SEC:
+        _NEWS_MEM = shared["news"]  # another worker refreshed recently
+        return
+    items = await fetch_ai_news_async()
+    if items:
+        _NEWS_MEM = items
+
+def _become_refresher() -> bool:
+    """
+    Without Redis, only one process on the host refreshes: whoever holds an exclusive flock on
+    REFRESHER_LOCK_PATH (kept for the life of the process). With Redis the news lock coordinates.
+    """
+    global _refresher_fd
+    if rds is not None or fcntl is None:
+        return True
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        fd = os.open(REFRESHER_LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError as e:
+        log.warning("Refresher lock unavailable (%s); refreshing from this worker.", e); return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd); return False
+    _refresher_fd = fd
+    return True
+
+def _refresh_loop() -> None:
+    global _NEWS_MEM
+    # Followers serve the leader's file copy and take over if the leader process goes away
+    while not _become_refresher():
+        _NEWS_MEM = load_cache() or _NEWS_MEM
+        time.sleep(REFRESH_FOLLOWER_POLL_SEC)
+    log.info("Background news refresh every %d sec.", NEWS_REFRESH_SEC)
+    while True:  # first pass is the startup warmup
+        try:
+            asyncio.run(refresh_news())
+        except Exception as e:
+            log.error("Background refresh error: %s", e)
+        time.sleep(NEWS_REFRESH_SEC)
+
+def start_background_refresh() -> None:
+    global _refresh_thread
+    with _refresh_start_lock:
+        if _refresh_thread is not None:
+            return
+        _refresh_thread = threading.Thread(target=_refresh_loop, name="news-refresh", daemon=True)
+        _refresh_thread.start()
+
+@app.before_request
+def _start_refresher_once():
+    # Started by the first request in each worker, not at import (tests, `flask routes`, scripts stay offline)
+    if BACKGROUND_REFRESH and _refresh_thread is None:
+        start_background_refresh()
+
+def get_news_items() -> List[Dict[str, Any]]:
+    """Request path: shared cache → this worker's copy → file. Never calls upstream."""
+    items = load_shared_news() or _NEWS_MEM or load_cache()
+    return items[:MAX_TOTAL_STORIES]
 
 # --------------------------------------------------------------------------------------
 # Routes
 # --------------------------------------------------------------------------------------
+NEWS_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=600"
+
+def conditional(resp, cache_control: str, vary_cookie: bool = False):
+    """Content-hash ETag + Cache-Control; answers a matching If-None-Match with an empty 304."""
+    resp.set_etag(hashlib.blake2b(resp.get_data(), digest_size=16).hexdigest())
+    resp.headers["Cache-Control"] = cache_control
+    if vary_cookie:
+        resp.vary.add("Cookie")  # body depends on session["lang"]
+    return resp.make_conditional(request)
+
+# News routes read the cache only; upstream latency lives in the background refresher.
 @app.route("/")
 def home():
-    items = fetch_ai_news()
-    return render_template("index.html", news_items=items)
+    items = localize(get_news_items(), session.get("lang", "EN"))
+    resp = make_response(render_template("index.html", news_items=items))
+    return conditional(resp, NEWS_CACHE_CONTROL, vary_cookie=True)
 
 @app.route("/api/news")
 def get_news():
-    return jsonify(fetch_ai_news())
+    resp = jsonify(localize(get_news_items(), session.get("lang", "EN")))
+    return conditional(resp, NEWS_CACHE_CONTROL, vary_cookie=True)
 
 # Markets (single definition; hide language dropdown on this page)
 @app.route("/markets", methods=["GET"], endpoint="markets_view")
 def markets_view():
     return render_template("markets.html", title="Markets", cache_bust=CACHE_VERSION, hide_lang=True)
 
+# Per-client rate limit for OHLC (may fall through to yfinance/RapidAPI upstream).
+# Sliding window in-process; fixed-window INCR+EXPIRE in Redis so all workers share the count.
+OHLC_RATE_LIMIT = int(os.getenv("OHLC_RATE_LIMIT", "30"))
+OHLC_RATE_WINDOW_SEC = 60
+_BUCKETS: Dict[str, deque] = {}
+_buckets_lock = threading.Lock()
+
+def allow(key: str, limit: int = OHLC_RATE_LIMIT, window: int = OHLC_RATE_WINDOW_SEC) -> bool:
+    if rds is not None:
+        try:
+            rkey = f"rl:{key}:{int(time.time() // window)}"
+            pipe = rds.pipeline()
+            pipe.incr(rkey)
+            pipe.expire(rkey, window)
+            count, _ = pipe.execute()
+            return count <= limit
+        except Exception as e:
+            log.warning("Redis rate-limit error: %s", e)
+    now = time.monotonic()
+    with _buckets_lock:
+        if len(_BUCKETS) > 10_000:  # drop idle clients so the map can't grow unbounded
+            for k in [k for k, q in _BUCKETS.items() if not q or q[-1] <= now - window]:
+                del _BUCKETS[k]
+        q = _BUCKETS.setdefault(key, deque())
+        while q and q[0] <= now - window:
+            q.popleft()
+        if len(q) >= limit:
+            return False
+        q.append(now)
+        return True
+
+def _client_ip() -> str:
+    # Socket peer, or the proxy-reported client via ProxyFix; the client-set left-most XFF hop is never trusted
+    return request.remote_addr or "unknown"
+
 # OHLC API
 @app.route("/api/ohlc/<symbol>", methods=["GET"], endpoint="api_ohlc")
 def api_ohlc_route(symbol):
+    if not allow(f"ohlc:{_client_ip()}"):
+        return {"error": "rate_limited"}, 429, {"Retry-After": str(OHLC_RATE_WINDOW_SEC)}
     range_ = request.args.get("range", "6mo")
     interval = request.args.get("interval", "1d")
     data = fetch_yahoo_chart(symbol, range_, interval)
-    resp = jsonify(data)
-    resp.headers["Cache-Control"] = "public, max-age=300"
-    return resp
+    return conditional(jsonify(data), "public, max-age=300")
 
 # --------------------------------------------------------------------------------------
 # Main
 # --------------------------------------------------------------------------------------
 if __name__ == "__main__":
     os.makedirs(DATA_DIR, exist_ok=True)
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
@@ -1,22 +1,65 @@
-import os, json, time, hashlib
+import io, os, time, hashlib, asyncio, tempfile, threading
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Dict, Any
+import httpx
+import orjson
+import pandas as pd
 import requests
-from flask import Flask, render_template, request, abort, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, render_template, request, abort
+
+# optional C ISO-8601 parser; stdlib fromisoformat fallback if not installed
+try:
+    import ciso8601
+except Exception:
+    ciso8601 = None
 
 # ----------------------------
 # App / Config
 # ----------------------------
 app = Flask(__name__)
 
+# optional gzip/brotli for JSON + HTML (Flask-Compress); uncompressed if not installed
+try:
+    from flask_compress import Compress
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json", "text/html"],
+        COMPRESS_LEVEL=6,
+        COMPRESS_MIN_SIZE=500,
+    )
+    Compress(app)
+except Exception:
+    pass
+
 GNEWS_API_KEY = os.getenv("GNEWS_API_KEY", "")
 NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY", "")
 
 # cache (English-only)
 CACHE_PATH = Path("data/news_cache.json")
 CACHE_TTL_MINUTES = int(os.getenv("CACHE_TTL_MINUTES", "60"))
-CACHE_VERSION = "en-only-v3"  # bump to invalidate any old bilingual caches
+CACHE_VERSION = "en-only-v4"  # bump to invalidate old caches (also busts static JS; v4: columnar price payload)
+
+# optional shared cache (multi-worker gunicorn); falls back to per-process dict + file
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+rds = None
+if REDIS_URL:
+    try:
+        import redis
+        rds = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    except Exception:
+        rds = None
+NEWS_REDIS_KEY = f"news:{CACHE_VERSION}"
+
+# one keep-alive pool for the sync price fetchers (Yahoo, Stooq)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
 
 # how many stories to display total
 MAX_STORIES = 12
@@ -51,8 +94,74 @@ def healthz():
 # ----------------------------
 # Prices API: Yahoo first, Stooq fallback
 # ----------------------------
-_YCHART_CACHE: Dict = {}        # key: (symbol, range, interval) -> (expires_epoch, payload)
+_YCHART_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()  # (symbol, range, interval) -> (expires_epoch, JSON bytes)
 _YCHART_TTL_SEC = 60 * 5        # cache 5 minutes
+_YCHART_MAX = 512               # LRU bound for the in-process copy
+_YCHART_LOCK = threading.Lock()
+_YCHART_INFLIGHT: Dict[tuple, threading.Event] = {}  # key -> set once the leader has stored a body
+
+def _ychart_get(key: tuple):
+    # Cached bodies are already-encoded JSON: a hit is served without decode/re-encode
+    if rds is not None:
+        try:
+            raw = rds.get("yc:%s:%s:%s" % key)
+            if raw:
+                return raw
+        except Exception:
+            pass
+    with _YCHART_LOCK:
+        cached = _YCHART_CACHE.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= time.time():
+            del _YCHART_CACHE[key]
+            return None
+        _YCHART_CACHE.move_to_end(key)
+        return cached[1]
+
+def _ychart_put(key: tuple, body: bytes) -> None:
+    # JSON only in Redis (no pickle)
+    if rds is not None:
+        try:
+            rds.setex("yc:%s:%s:%s" % key, _YCHART_TTL_SEC, body)
+            return
+        except Exception:
+            pass
+    with _YCHART_LOCK:
+        _YCHART_CACHE[key] = (time.time() + _YCHART_TTL_SEC, body)
+        _YCHART_CACHE.move_to_end(key)
+        while len(_YCHART_CACHE) > _YCHART_MAX:
+            _YCHART_CACHE.popitem(last=False)
+
+def _ychart_get_or_set(key: tuple, fetch) -> bytes:
+    """Cached body for key, else fetch() once: concurrent misses wait for the first caller."""
+    body = _ychart_get(key)
+    if body is not None:
+        return body
+    with _YCHART_LOCK:
+        event = _YCHART_INFLIGHT.get(key)
+        leader = event is None
+        if leader:
+            event = _YCHART_INFLIGHT[key] = threading.Event()
+    if not leader:
+        event.wait(timeout=30)
+        body = _ychart_get(key)
+        if body is not None:
+            return body
+        # leader failed or timed out: fetch ourselves rather than fail the request
+    try:
+        body = fetch()
+        _ychart_put(key, body)
+        return body
+    finally:
+        if leader:
+            with _YCHART_LOCK:
+                _YCHART_INFLIGHT.pop(key, None)
+            event.set()
+
+def _empty_series() -> Dict[str, list]:
+    # Columnar (SoA) price series: parallel arrays instead of one dict per candle
+    return {"t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
 
 def _yahoo_price_history(symbol: str, range_: str, interval: str):
     headers = {
@@ -67,14 +176,14 @@ def _yahoo_price_history(symbol: str, range_: str, interval: str):
         "events": "div,splits",
         "region": "US",
     }
-    r = requests.get(url, params=params, headers=headers, timeout=15)
+    r = SESSION.get(url, params=params, headers=headers, timeout=15)
     if r.status_code != 200:
-        return []
+        return _empty_series()
 
     j = r.json()
     result = (j.get("chart") or {}).get("result") or []
     if not result:
-        return []
+        return _empty_series()
 
     res = result[0]
     ts = res.get("timestamp") or []
@@ -86,19 +195,17 @@ def _yahoo_price_history(symbol: str, range_: str, interval: str):
     close  = q.get("close")  or []
     volume = q.get("volume") or []
 
-    candles = []
+    series = _empty_series()
     for i, t in enumerate(ts):
         c = close[i] if i < len(close) else None
         if isinstance(c, (int, float)):
-            candles.append({
-                "t": int(t) * 1000,  # ms
-                "o": open_[i]  if i < len(open_)  else None,
-                "h": high[i]   if i < len(high)   else None,
-                "l": low[i]    if i < len(low)    else None,
-                "c": c,
-                "v": volume[i] if i < len(volume) else None,
-            })
-    return candles
+            series["t"].append(int(t) * 1000)  # ms
+            series["o"].append(open_[i]  if i < len(open_)  else None)
+            series["h"].append(high[i]   if i < len(high)   else None)
+            series["l"].append(low[i]    if i < len(low)    else None)
+            series["c"].append(c)
+            series["v"].append(volume[i] if i < len(volume) else None)
+    return series
 
 def _stooq_symbol(symbol: str) -> str:
     # Stooq uses lowercase + ".us" for U.S. tickers (NVDA, MSFT, GOOGL, AMZN, TSM)
@@ -107,12 +214,12 @@ def _stooq_symbol(symbol: str) -> str:
 def _stooq_price_history(symbol: str, range_: str):
     s = _stooq_symbol(symbol)
     url = f"https://stooq.com/q/d/l/?s={s}&i=d"
-    r = requests.get(url, timeout=15)
+    r = SESSION.get(url, timeout=15)
     if r.status_code != 200 or not r.text or "Date,Open,High,Low,Close,Volume" not in r.text:
-        return []
+        return _empty_series()
 
-    lines = r.text.strip().splitlines()
-    rows = lines[1:]  # skip header
+    # Parse the whole CSV in C; only Date/Close are plotted
+    df = pd.read_csv(io.StringIO(r.text), usecols=["Date", "Close"], on_bad_lines="skip")
 
     # Determine how many days to keep based on range
     today = date.today()
@@ -131,25 +238,18 @@ def _stooq_price_history(symbol: str, range_: str):
     elif range_ == "5y":
         want_days = 5 * 370
     else:  # "max"
-        want_days = len(rows)
+        want_days = len(df)
 
-    rows = rows[-want_days:]
+    df = df.tail(want_days)
+    days = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce", utc=True)
+    close = pd.to_numeric(df["Close"], errors="coerce")
+    ok = (days.notna() & close.notna()).to_numpy()
 
-    candles = []
-    for line in rows:
-        parts = line.split(",")
-        if len(parts) < 5:
-            continue
-        dstr, _o, _h, _l, c = parts[:5]
-        try:
-            # Noon UTC for plotting on a daily series
-            ts = datetime.strptime(dstr, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
-            t_ms = int(ts) * 1000 + (12 * 3600 * 1000)
-            c_val = float(c)
-            candles.append({"t": t_ms, "o": None, "h": None, "l": None, "c": c_val, "v": None})
-        except Exception:
-            continue
-    return candles
+    # Noon UTC for plotting on a daily series
+    t_ms = days.to_numpy(dtype="datetime64[ms]")[ok].astype("int64") + (12 * 3600 * 1000)
+    c_vals = close.to_numpy(dtype="float64")[ok]
+    none = [None] * len(c_vals)
+    return {"t": t_ms.tolist(), "o": none, "h": none, "l": none, "c": c_vals.tolist(), "v": none}
 
 @app.get("/api/price_history")
 def api_price_history():
@@ -162,27 +262,23 @@ def api_price_history():
     if range_ not in allowed_ranges or interval not in allowed_intervals:
         abort(400)
 
-    key = (symbol, range_, interval)
-    now = time.time()
-    cached = _YCHART_CACHE.get(key)
-    if cached and cached[0] > now:
-        return jsonify(cached[1])
-
-    # Try Yahoo first (intraday capable), then Stooq (daily)
-    try:
-        candles = _yahoo_price_history(symbol, range_, interval)
-    except Exception:
-        candles = []
-
-    if not candles:
+    def fetch() -> bytes:
+        # Try Yahoo first (intraday capable), then Stooq (daily)
         try:
-            candles = _stooq_price_history(symbol, range_)
+            series = _yahoo_price_history(symbol, range_, interval)
         except Exception:
-            candles = []
+            series = _empty_series()
+
+        if not series["t"]:
+            try:
+                series = _stooq_price_history(symbol, range_)
+            except Exception:
+                series = _empty_series()
 
-    payload = {"symbol": symbol, "range": range_, "interval": interval, "candles": candles}
-    _YCHART_CACHE[key] = (now + _YCHART_TTL_SEC, payload)
-    return jsonify(payload)
+        return orjson.dumps({"symbol": symbol, "range": range_, "interval": interval, **series})
+
+    body = _ychart_get_or_set((symbol, range_, interval), fetch)
+    return Response(body, mimetype="application/json")
 
 # ----------------------------
 # Utility
@@ -191,18 +287,44 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 def read_cache() -> Dict[str, Any]:
+    if rds is not None:
+        try:
+            raw = rds.get(NEWS_REDIS_KEY)
+            if raw:
+                return orjson.loads(raw)
+        except Exception:
+            pass
     if not CACHE_PATH.exists():
         return {}
     try:
-        with open(CACHE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(CACHE_PATH.read_bytes())
     except Exception:
         return {}
 
 def write_cache(payload: Dict[str, Any]) -> None:
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    if rds is not None:
+        try:
+            rds.setex(NEWS_REDIS_KEY, CACHE_TTL_MINUTES * 60, orjson.dumps(payload))
+        except Exception:
+            pass
+    # file copy stays as the restart / Redis-down fallback; a failed persist must not fail the page
+    tmp = None
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # unique tmp per write + rename: concurrent writers can't collide, a crash can't truncate
+        fd, tmp = tempfile.mkstemp(dir=CACHE_PATH.parent, prefix=CACHE_PATH.name + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp, CACHE_PATH)
+        tmp = None
+    except Exception:
+        pass
+    finally:
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
 
 def cache_is_fresh(cache: Dict[str, Any]) -> bool:
     if not cache or cache.get("version") != CACHE_VERSION:
@@ -228,7 +350,9 @@ def _h(s: str) -> str:
 # ----------------------------
 # News fetchers (EN only)
 # ----------------------------
-def fetch_gnews() -> List[Dict[str, Any]]:
+HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
+async def fetch_gnews(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     if not GNEWS_API_KEY:
         return []
     url = "https://gnews.io/api/v4/search"
@@ -239,7 +363,7 @@ def fetch_gnews() -> List[Dict[str, Any]]:
         "token": GNEWS_API_KEY,
     }
     try:
-        r = requests.get(url, params=params, timeout=15)
+        r = await client.get(url, params=params, timeout=15)
         if r.status_code != 200:
             return []
         data = r.json()
@@ -259,7 +383,7 @@ def fetch_gnews() -> List[Dict[str, Any]]:
     except Exception:
         return []
 
-def fetch_newsdata() -> List[Dict[str, Any]]:
+async def fetch_newsdata(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
     if not NEWSDATA_API_KEY:
         return []
     url = "https://newsdata.io/api/1/news"
@@ -272,7 +396,7 @@ def fetch_newsdata() -> List[Dict[str, Any]]:
         "size": 10
     }
     try:
-        r = requests.get(url, params=params, timeout=20)
+        r = await client.get(url, params=params, timeout=20)
         if r.status_code != 200:
             return []
         data = r.json()
@@ -293,6 +417,11 @@ def fetch_newsdata() -> List[Dict[str, Any]]:
     except Exception:
         return []
 
+async def fetch_all() -> List[List[Dict[str, Any]]]:
+    # Both providers in flight at once over one pooled client: latency = slowest call, not the sum
+    async with httpx.AsyncClient(limits=HTTP_LIMITS) as client:
+        return await asyncio.gather(fetch_gnews(client), fetch_newsdata(client))
+
 # ----------------------------
 # Post-processing
 # ----------------------------
@@ -322,21 +451,27 @@ def add_badges(stories: List[Dict[str, Any]]) -> None:
             badges = ["AI"]
         s["badges"] = badges
 
-def sort_by_date(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def _ts(s: Dict[str, Any]) -> float:
-        p = s.get("published_at") or ""
+@lru_cache(maxsize=4096)
+def _parse_ts(p: str) -> float:
+    # Provider dates repeat across refreshes; C parser when available, stdlib otherwise
+    if ciso8601 is not None:
         try:
-            return datetime.fromisoformat(p.replace("Z","+00:00")).timestamp()
-        except Exception:
-            return 0.0
-    return sorted(stories, key=_ts, reverse=True)
+            return ciso8601.parse_datetime(p).timestamp()
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(p.replace("Z","+00:00")).timestamp()
+    except Exception:
+        return 0.0
+
+def sort_by_date(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(stories, key=lambda s: _parse_ts(s.get("published_at") or ""), reverse=True)
 
 # ----------------------------
 # Core
 # ----------------------------
 def get_fresh_stories() -> List[Dict[str, Any]]:
-    gnews = fetch_gnews()
-    newsdata = fetch_newsdata()
+    gnews, newsdata = asyncio.run(fetch_all())
     merged = dedupe(gnews + newsdata)
     add_badges(merged)
     return sort_by_date(merged)[:MAX_STORIES]
@@ -20,9 +20,12 @@
     const url = `/api/price_history?symbol=${encodeURIComponent(state.symbol)}&range=${encodeURIComponent(state.range)}&interval=${encodeURIComponent(state.interval)}`;
     const r = await fetch(url);
     const j = await r.json();
-    const pts = (j.candles || [])
-      .filter(p => p && typeof p.c === "number" && typeof p.t === "number")
-      .map(p => ({ x: p.t, y: p.c }));
+    // columnar payload: parallel arrays j.t (ms) / j.c (close)
+    const t = j.t || [], c = j.c || [];
+    const pts = [];
+    for (let i = 0; i < t.length; i++) {
+      if (typeof t[i] === "number" && typeof c[i] === "number") pts.push({ x: t[i], y: c[i] });
+    }
     return pts;
   }
 